@@ -1,4 +1,46 @@
-from .peptide_fragmentor import PeptideFragment0r
+from importlib import import_module
+
 from .knowledge_base import neutral_losses
 from .knowledge_base import PROTON
+from .knowledge_base import element_masses
+from .knowledge_base import amino_acid_compositions
+from .knowledge_base import unimod_compositions
+from .knowledge_base import fragment_starts_forward
+from .knowledge_base import fragment_starts_reverse
+from .knowledge_base import crosslinkers
+from .knowledge_base import monosaccharide_compositions
+from .knowledge_base import oxonium_ions
+from .knowledge_base import gap_modifications
+
+# Heavy dependencies (pandas, pyqms) and numpy are only imported once one
+# of these attributes is accessed.
+_lazy_attributes = {
+    'PeptideFragment0r': '.peptide_fragmentor',
+    'LadderFragment0r': '.ladder_fragmentor',
+    'FRAGMENT_DTYPE': '.masses',
+    'fragment_masses': '.masses',
+    'ion_ladders': '.masses',
+    'residue_masses': '.masses',
+    'crosslink_fragments': '.crosslink',
+    'crosslink_library': '.crosslink',
+    'GlycoFragment0r': '.glyco',
+    'reverse_decoy': '.decoy',
+    'shuffle_decoy': '.decoy',
+    'target_decoy_fragments': '.decoy',
+    'GapTable': '.gap_table',
+    'dia_fragment_tables': '.dia',
+}
+
+
+def __getattr__(name):
+    if name not in _lazy_attributes:
+        raise AttributeError(
+            'module {0!r} has no attribute {1!r}'.format(__name__, name)
+        )
+    value = getattr(import_module(_lazy_attributes[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(list(globals().keys()) + list(_lazy_attributes.keys()))
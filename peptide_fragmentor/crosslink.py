@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Fragmentation of cross-linked peptide pairs.
+
+Fragments of the alpha and beta chain are calculated from the ladders of
+`peptide_fragmentor.masses`; every fragment that contains the link site
+carries the linker and the complete partner peptide. For MS-cleavable
+linkers the signature doublets (peptide + linker stub) are added.
+"""
+import numpy as np
+
+import peptide_fragmentor
+from peptide_fragmentor.masses import (
+    FRAGMENT_DTYPE,
+    residue_masses,
+    precursor_mass,
+    composition_mass,
+    ion_offsets,
+    ion_ladders,
+    ladders_to_fragments,
+    add_fields,
+    mass_to_mz,
+    block_index,
+)
+
+
+CROSSLINK_FIELDS = [
+    ('chain', 'U5'),
+    ('pair', np.int32),
+]
+
+
+def _linker(linker):
+    try:
+        return peptide_fragmentor.crosslinkers[linker]
+    except KeyError:
+        raise KeyError(
+            'Unknown cross-linker {0}, add it to peptide_fragmentor.crosslinkers'.format(
+                linker
+            )
+        )
+
+
+def _chain_fragments(masses, link_pos, ions, charges):
+    """
+    Fragment one chain without partner.
+
+    Returns:
+        tuple: fragments (FRAGMENT_DTYPE) and a bool per fragment, True if
+            the fragment contains `link_pos`, i.e. carries the partner
+    """
+    n = len(masses)
+    ion_length = np.arange(1, n + 1)
+    ladders = ion_ladders(masses, ions=ions)
+    linked = []
+    for ion, (is_forward, offset) in ion_offsets(ions).items():
+        if is_forward:
+            linked.append(ion_length >= link_pos)
+        else:
+            linked.append(ion_length >= n - link_pos + 1)
+    linked = np.concatenate(linked) if len(linked) > 0 else np.zeros(0, dtype=bool)
+    return ladders_to_fragments(ladders, charges=charges), np.tile(linked, len(charges))
+
+
+def _signature_fragments(masses, cleavage_products, charges):
+    """
+    Return the intact chain carrying each stub of a cleaved linker.
+    """
+    mass = precursor_mass(masses)
+    stubs = {
+        '+{0}'.format(stub): np.array([mass + composition_mass(cc)])
+        for stub, cc in cleavage_products.items()
+    }
+    fragments = ladders_to_fragments(stubs, charges=charges)
+    fragments['pos'] = len(masses)
+    return fragments
+
+
+def crosslink_fragments(alpha, beta, alpha_link_pos, beta_link_pos,
+                        linker='DSSO', ions=None, charges=None):
+    """
+    Fragment the cross-linked peptide pair `alpha` and `beta`.
+
+    Args:
+        alpha (str): alpha peptide with optional Unimod modification string
+        beta (str): beta peptide with optional Unimod modification string
+        alpha_link_pos (int): linked residue of alpha, 1 is the first residue
+        beta_link_pos (int): linked residue of beta, 1 is the first residue
+        linker (str, optional): key of `peptide_fragmentor.crosslinkers`,
+            default is DSSO
+        ions (list of str, optional): ion series, default is a, b, y
+        charges (list, optional): default is 1, 2, 3
+
+    Returns:
+        np.ndarray: structured array with the fields of FRAGMENT_DTYPE and
+            `chain` (alpha or beta) and `pair`. Signature ions of cleavable
+            linkers have the series +<stub>, e.g. +A, and pos equal to the
+            chain length.
+    """
+    return crosslink_library(
+        [(alpha, beta, alpha_link_pos, beta_link_pos)],
+        linker=linker,
+        ions=ions,
+        charges=charges,
+    )
+
+
+def crosslink_library(pairs, linker='DSSO', ions=None, charges=None):
+    """
+    Fragment many cross-linked peptide pairs.
+
+    The unlinked fragments and the link site mask are calculated once per
+    (peptide, link position), signature ions once per peptide. Every pair
+    then only adds its partner mass, the library is assembled in one go.
+
+    Args:
+        pairs (iterable): (alpha, beta, alpha_link_pos, beta_link_pos) tuples
+        linker (str, optional): key of `peptide_fragmentor.crosslinkers`,
+            default is DSSO
+        ions (list of str, optional): ion series, default is a, b, y
+        charges (list, optional): default is 1, 2, 3
+
+    Returns:
+        np.ndarray: fragments of all pairs, see `crosslink_fragments`, the
+            field `pair` is the index of the pair in `pairs`
+    """
+    if charges is None:
+        charges = [1, 2, 3]
+    linker = _linker(linker)
+    linker_mass = composition_mass(linker['cc'])
+    cleavage_products = linker['cleavage_products']
+
+    # blocks are cached fragment arrays, chains first, signatures appended
+    chain_blocks = {}
+    blocks = []
+    linked_blocks = []
+    peptides = {}
+    peptide_masses = []
+    signature_blocks = []
+    pair_blocks = []
+    pair_shifts = []
+    for alpha, beta, alpha_link_pos, beta_link_pos in pairs:
+        chains = [
+            ('alpha', alpha, alpha_link_pos),
+            ('beta', beta, beta_link_pos),
+        ]
+        chain_peptides = []
+        for chain, upep, link_pos in chains:
+            if upep not in peptides:
+                peptides[upep] = (len(peptide_masses), residue_masses(upep))
+                peptide_masses.append(precursor_mass(peptides[upep][1]))
+                signature_blocks.append(
+                    _signature_fragments(peptides[upep][1], cleavage_products, charges)
+                )
+            peptide_index, masses = peptides[upep]
+            chain_peptides.append(peptide_index)
+            if (upep, link_pos) not in chain_blocks:
+                if not 1 <= link_pos <= len(masses):
+                    raise ValueError(
+                        'Link position {0} outside of {1} chain with {2} residues'.format(
+                            link_pos, chain, len(masses)
+                        )
+                    )
+                fragments, linked = _chain_fragments(masses, link_pos, ions, charges)
+                chain_blocks[(upep, link_pos)] = len(blocks)
+                blocks.append(fragments)
+                linked_blocks.append(linked)
+            pair_blocks.append(chain_blocks[(upep, link_pos)])
+            # signature block index, shifted once all chains are known
+            pair_blocks.append(-1 - peptide_index)
+        pair_shifts.append(peptide_masses[chain_peptides[1]] + linker_mass)
+        pair_shifts.append(peptide_masses[chain_peptides[0]] + linker_mass)
+
+    blocks += signature_blocks
+    linked_blocks += [np.zeros(len(block), dtype=bool) for block in signature_blocks]
+    pair_blocks = np.array(pair_blocks, dtype=np.int64)
+    pair_blocks[pair_blocks < 0] = len(chain_blocks) - 1 - pair_blocks[pair_blocks < 0]
+    lengths = np.array([len(block) for block in blocks], dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    pool = np.concatenate([np.empty(0, dtype=FRAGMENT_DTYPE)] + blocks)
+    pool_linked = np.concatenate([np.zeros(0, dtype=bool)] + linked_blocks)
+
+    # per pair: alpha chain, alpha signatures, beta chain, beta signatures
+    n_pairs = len(pair_shifts) // 2
+    block_lengths = lengths[pair_blocks] if len(pair_blocks) > 0 else \
+        np.zeros(0, dtype=np.int64)
+    index = block_index(offsets[pair_blocks], block_lengths)
+    fragments = add_fields(
+        pool[index],
+        CROSSLINK_FIELDS,
+        chain=np.repeat(np.tile(['alpha', 'alpha', 'beta', 'beta'], n_pairs), block_lengths),
+        pair=np.repeat(np.repeat(np.arange(n_pairs, dtype=np.int32), 4), block_lengths),
+    )
+    shifts = np.repeat(np.repeat(np.array(pair_shifts), 2), block_lengths)
+    fragments['mass'] += shifts * pool_linked[index]
+    fragments['mz'] = mass_to_mz(fragments['mass'], fragments['charge'])
+    return fragments
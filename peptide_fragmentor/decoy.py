@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Decoy peptides and target-decoy fragment libraries.
+
+Decoys are pseudo-reversed or shuffled peptides with the C-terminal residue
+kept in place, modifications move with their residue and N-terminal
+modifications stay at the N-Term. Decoy ladders are built by permuting the
+residue masses of the target instead of parsing the decoy again.
+
+Decoys that equal their target (e.g. palindromes or AAK), treating I and L
+as the same residue, would only duplicate target fragments and are
+returned as None.
+"""
+import numpy as np
+
+from peptide_fragmentor.masses import (
+    FRAGMENT_DTYPE,
+    split_upep,
+    residue_masses,
+    modification_mass,
+    ion_ladders,
+    ladders_to_fragments,
+    add_fields,
+)
+
+
+TARGET_DECOY_FIELDS = [
+    ('peptide', np.int32),
+    ('decoy', np.bool_),
+]
+
+
+def decoy_order(upep, method='reverse', rng=None, attempts=100):
+    """
+    Return the target residue index of every decoy residue.
+
+    Args:
+        upep (str): target peptide with optional Unimod modification string
+        method (str, optional): reverse or shuffle, default is reverse
+        rng (np.random.Generator, optional): used for shuffle
+        attempts (int, optional): shuffles that reproduce the target (see
+            `_decoy_upep`) are repeated up to `attempts` times
+
+    Returns:
+        np.ndarray: decoy residue i is target residue order[i]
+    """
+    if method not in ('reverse', 'shuffle'):
+        raise ValueError('Unknown decoy method {0}'.format(method))
+    n = len(split_upep(upep)[0])
+    if n < 2:
+        return np.arange(n)
+    if method == 'reverse':
+        return np.r_[np.arange(n - 2, -1, -1), n - 1]
+    if rng is None:
+        rng = np.random.default_rng()
+    for attempt in range(attempts):
+        order = np.r_[rng.permutation(n - 1), n - 1]
+        if _decoy_upep(upep, order) is not None:
+            break
+    return order
+
+
+def permute_upep(upep, order):
+    """
+    Rearrange the residues of `upep` by `order`, modifications move along.
+
+    Args:
+        upep (str): Peptide with optional Unimod modification string
+        order (np.ndarray): as returned by `decoy_order`
+
+    Returns:
+        str: the permuted upep
+    """
+    peptide, mods = split_upep(upep)
+    new_pos = np.empty(len(order), dtype=int)
+    new_pos[order] = np.arange(1, len(order) + 1)
+    permuted = ''.join(peptide[i] for i in order)
+    if len(mods) == 0:
+        return permuted
+    permuted_mods = []
+    for unimod, pos in mods:
+        if 1 <= pos <= len(peptide):
+            pos = int(new_pos[pos - 1])
+        permuted_mods.append((pos, unimod))
+    return '{0}#{1}'.format(
+        permuted,
+        ';'.join('{0}:{1}'.format(unimod, pos) for pos, unimod in sorted(permuted_mods))
+    )
+
+
+def _decoy_upep(upep, order):
+    """
+    Return the decoy upep or None if it equals the target, I and L are equal.
+    """
+    target = permute_upep(upep, np.arange(len(order)))
+    decoy = permute_upep(upep, order)
+    target_peptide, target_mods = split_upep(target)
+    decoy_peptide, decoy_mods = split_upep(decoy)
+    if target_peptide.replace('L', 'I') == decoy_peptide.replace('L', 'I') and \
+            target_mods == decoy_mods:
+        return None
+    return decoy
+
+
+def reverse_decoy(upep):
+    """
+    Pseudo-reverse `upep`, the C-terminal residue is kept.
+
+    Returns:
+        str: decoy upep, None if it equals `upep`
+    """
+    return _decoy_upep(upep, decoy_order(upep, method='reverse'))
+
+
+def shuffle_decoy(upep, seed=None):
+    """
+    Shuffle `upep` with `seed`, the C-terminal residue is kept.
+
+    Returns:
+        str: decoy upep, None if no shuffle within the attempts of
+            `decoy_order` differs from `upep`
+    """
+    rng = np.random.default_rng(seed)
+    return _decoy_upep(upep, decoy_order(upep, method='shuffle', rng=rng))
+
+
+def _decoy_masses(masses, mods, order):
+    decoy_masses = masses[order]
+    n_term_mass = sum(modification_mass(unimod) for unimod, pos in mods if pos == 0)
+    if n_term_mass != 0 and len(order) > 0:
+        # residue_masses counts N-Term mods for the first residue, move it back
+        decoy_masses[np.flatnonzero(order == 0)[0]] -= n_term_mass
+        decoy_masses[0] += n_term_mass
+    return decoy_masses
+
+
+def target_decoy_fragments(upeps, method='reverse', seed=None, ions=None, charges=None):
+    """
+    Fragment targets and their decoys into one array.
+
+    Args:
+        upeps (list of str): target peptides with optional Unimod
+            modification strings
+        method (str, optional): reverse or shuffle, default is reverse
+        seed (int, optional): seed for shuffle, all decoys are drawn from one
+            generator in order of `upeps`
+        ions (list of str, optional): ion series, default is a, b, y
+        charges (list, optional): default is 1, 2, 3
+
+    Returns:
+        tuple: fragments (np.ndarray with the fields of FRAGMENT_DTYPE and
+            `peptide`, the index in `upeps`, and `decoy`) and the list of
+            decoy upeps. Decoys equal to their target are None and have no
+            fragments.
+    """
+    rng = np.random.default_rng(seed)
+    fragments = []
+    decoys = []
+    for i, upep in enumerate(upeps):
+        mods = split_upep(upep)[1]
+        masses = residue_masses(upep)
+        order = decoy_order(upep, method=method, rng=rng)
+        decoy = _decoy_upep(upep, order)
+        decoys.append(decoy)
+        ladder_sets = [(False, masses)]
+        if decoy is not None:
+            ladder_sets.append((True, _decoy_masses(masses, mods, order)))
+        for is_decoy, ladder_masses in ladder_sets:
+            fragments.append(
+                add_fields(
+                    ladders_to_fragments(
+                        ion_ladders(ladder_masses, ions=ions), charges=charges
+                    ),
+                    TARGET_DECOY_FIELDS,
+                    peptide=i,
+                    decoy=is_decoy,
+                )
+            )
+    if len(fragments) == 0:
+        fragments = [np.empty(0, dtype=FRAGMENT_DTYPE.descr + TARGET_DECOY_FIELDS)]
+    return np.concatenate(fragments), decoys
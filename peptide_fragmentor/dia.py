@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Fragment tables grouped by DIA isolation window.
+
+All precursors are fragmented into one array, precursors are assigned to
+the isolation windows by binary search and every window gets its
+fragments sorted by m/z, ready for a single pass XIC extraction.
+"""
+import numpy as np
+
+from peptide_fragmentor.masses import (
+    FRAGMENT_DTYPE,
+    residue_masses,
+    precursor_mass,
+    ion_ladders,
+    ladders_to_fragments,
+    add_fields,
+    mass_to_mz,
+    block_index,
+)
+
+
+DIA_FIELDS = [
+    ('precursor', np.int32),
+    ('interference', np.bool_),
+]
+
+
+def assign_windows(mzs, windows):
+    """
+    Find the precursors inside each isolation window.
+
+    Windows may overlap, a precursor can then be part of several windows.
+
+    Args:
+        mzs (np.ndarray): precursor m/z
+        windows (array like): (lower, upper) m/z of each window, both
+            inclusive
+
+    Returns:
+        list of np.ndarray: precursor indices per window, ascending
+    """
+    windows = np.asarray(windows, dtype=np.float64).reshape(-1, 2)
+    if np.any(windows[:, 0] > windows[:, 1]):
+        raise ValueError('Isolation window with lower > upper m/z')
+    order = np.argsort(mzs, kind='stable')
+    sorted_mzs = np.asarray(mzs)[order]
+    start = np.searchsorted(sorted_mzs, windows[:, 0], side='left')
+    stop = np.searchsorted(sorted_mzs, windows[:, 1], side='right')
+    return [np.sort(order[a:b]) for a, b in zip(start, stop)]
+
+
+def flag_interference(mz, precursor, tolerance):
+    """
+    Flag fragments within `tolerance` of a fragment of another precursor.
+
+    Args:
+        mz (np.ndarray): fragment m/z, sorted ascending
+        precursor (np.ndarray): precursor (or peptide) index of each
+            fragment, fragments with the same index never interfere
+        tolerance (float): absolute tolerance in m/z
+
+    Returns:
+        np.ndarray: bool per fragment
+    """
+    if len(mz) == 0:
+        return np.zeros(0, dtype=bool)
+    lo = np.searchsorted(mz, mz - tolerance, side='left')
+    hi = np.searchsorted(mz, mz + tolerance, side='right')
+    # reduceat over the interleaved bounds reduces precursor[lo:hi], the
+    # sentinel makes hi == len(mz) a valid index
+    bounds = np.column_stack((lo, hi)).ravel()
+    padded = np.append(precursor, precursor[-1])
+    range_min = np.minimum.reduceat(padded, bounds)[::2]
+    range_max = np.maximum.reduceat(padded, bounds)[::2]
+    return (range_min != precursor) | (range_max != precursor)
+
+
+def dia_fragment_tables(precursors, windows, ions=None, charges=None,
+                        interference_tolerance=None):
+    """
+    Build the m/z sorted fragment table of every isolation window.
+
+    Args:
+        precursors (list): (upep, charge) tuples, upep with optional Unimod
+            modification string
+        windows (array like): (lower, upper) m/z of each window
+        ions (list of str, optional): ion series, default is a, b, y
+        charges (list, optional): fragment charges, default is 1, 2, 3,
+            charges above the precursor charge are skipped
+        interference_tolerance (float, optional): flag fragments within this
+            m/z tolerance of a fragment of another peptide in the same
+            window, charge states of the same upep do not interfere with
+            each other, default is no flagging
+
+    Returns:
+        list of np.ndarray: one array per window with the fields of
+            FRAGMENT_DTYPE plus `precursor` (index in `precursors`) and
+            `interference`, sorted by m/z
+    """
+    if charges is None:
+        charges = [1, 2, 3]
+    # upep -> (peptide index, ladders, neutral precursor mass)
+    peptides = {}
+    peptide_index = np.empty(len(precursors), dtype=np.int64)
+    mzs = np.empty(len(precursors))
+    fragments = [np.empty(0, dtype=FRAGMENT_DTYPE)]
+    for i, (upep, charge) in enumerate(precursors):
+        if upep not in peptides:
+            masses = residue_masses(upep)
+            peptides[upep] = (
+                len(peptides),
+                ion_ladders(masses, ions=ions),
+                precursor_mass(masses),
+            )
+        peptide_index[i], ladders, mass = peptides[upep]
+        mzs[i] = mass_to_mz(mass, charge)
+        fragments.append(
+            ladders_to_fragments(
+                ladders, charges=[c for c in charges if c <= charge]
+            )
+        )
+    lengths = np.array([len(f) for f in fragments[1:]], dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    fragments = add_fields(
+        np.concatenate(fragments),
+        DIA_FIELDS,
+        precursor=np.repeat(np.arange(len(precursors), dtype=np.int32), lengths),
+        interference=False,
+    )
+    fragment_peptides = np.repeat(peptide_index, lengths)
+
+    tables = []
+    for window_precursors in assign_windows(mzs, windows):
+        # indices of all fragments of the window precursors in one go
+        index = block_index(offsets[window_precursors], lengths[window_precursors])
+        order = np.argsort(fragments['mz'][index], kind='stable')
+        table = fragments[index[order]]
+        if interference_tolerance is not None:
+            table['interference'] = flag_interference(
+                table['mz'], fragment_peptides[index[order]], interference_tolerance
+            )
+        tables.append(table)
+    return tables
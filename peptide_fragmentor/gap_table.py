@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Mass table of residue combinations to explain gaps between peaks.
+
+All combinations of 1 up to `max_length` (modified) residues are summed once,
+sorted by mass and cached to disk, so explaining a mass difference is a
+binary search. Combinations are unordered, i.e. GA and AG are one entry
+written as A+G.
+"""
+from itertools import combinations_with_replacement
+import hashlib
+import json
+import os
+
+import numpy as np
+
+import peptide_fragmentor
+from peptide_fragmentor.masses import amino_acid_masses, modification_mass
+
+
+# bump if the layout of the cached file changes
+GAP_TABLE_VERSION = 1
+
+_gap_tables = {}
+
+
+def default_cache_dir():
+    """
+    Return the gap table cache directory.
+
+    Set PEPTIDE_FRAGMENTOR_CACHE to override ~/.cache/peptide_fragmentor.
+    """
+    return os.environ.get(
+        'PEPTIDE_FRAGMENTOR_CACHE',
+        os.path.join(os.path.expanduser('~'), '.cache', 'peptide_fragmentor')
+    )
+
+
+def gap_units(modifications=None):
+    """
+    Return the building blocks of the gap table.
+
+    Args:
+        modifications (dict, optional): unimod -> amino acids, default is
+            `peptide_fragmentor.gap_modifications`
+
+    Returns:
+        tuple: labels (list of str) and masses (np.ndarray), sorted by label
+    """
+    if modifications is None:
+        modifications = peptide_fragmentor.gap_modifications
+    units = dict(amino_acid_masses())
+    for unimod, amino_acids in modifications.items():
+        for aa in amino_acids:
+            units['{0}[{1}]'.format(aa, unimod)] = \
+                amino_acid_masses()[aa] + modification_mass(unimod)
+    labels = sorted(units.keys())
+    return labels, np.array([units[label] for label in labels])
+
+
+class GapTable:
+    def __init__(self, masses, labels):
+        """
+        Initialize GapTable, use `GapTable.load` to build or read a table.
+
+        Args:
+            masses (np.ndarray): combination masses, sorted ascending
+            labels (np.ndarray): combination labels, e.g. A+G+M[Oxidation]
+        """
+        self.masses = masses
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.masses)
+
+    @classmethod
+    def build(cls, max_length=3, modifications=None):
+        """
+        Enumerate all combinations of 1 to `max_length` residues.
+        """
+        unit_labels, unit_masses = gap_units(modifications)
+        masses = []
+        labels = []
+        for length in range(1, max_length + 1):
+            index = np.array(
+                list(combinations_with_replacement(range(len(unit_labels)), length)),
+                dtype=np.int32
+            )
+            masses.append(unit_masses[index].sum(axis=1))
+            labels.extend('+'.join(unit_labels[i] for i in row) for row in index)
+        masses = np.concatenate(masses)
+        labels = np.array(labels)
+        order = np.argsort(masses, kind='stable')
+        return cls(masses[order], labels[order])
+
+    @classmethod
+    def load(cls, max_length=3, modifications=None, cache_dir=None):
+        """
+        Return the gap table, built once and cached in memory and on disk.
+
+        The in-memory cache is keyed by the table definition only, i.e. it is
+        shared by all `cache_dir`. If the table cannot be written to
+        `cache_dir` it is only cached in memory.
+
+        Args:
+            max_length (int, optional): maximum number of residues, default 3
+            modifications (dict, optional): unimod -> amino acids, default is
+                `peptide_fragmentor.gap_modifications`
+            cache_dir (str, optional): default is `default_cache_dir()`
+        """
+        unit_labels, unit_masses = gap_units(modifications)
+        key = hashlib.sha1(
+            json.dumps(
+                [GAP_TABLE_VERSION, max_length, unit_labels, unit_masses.tolist()]
+            ).encode()
+        ).hexdigest()
+        if key in _gap_tables:
+            return _gap_tables[key]
+
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        cache_file = os.path.join(cache_dir, 'gap_table_{0}.npz'.format(key))
+        if os.path.exists(cache_file):
+            with np.load(cache_file) as cached:
+                table = cls(cached['masses'], cached['labels'])
+        else:
+            table = cls.build(max_length=max_length, modifications=modifications)
+            # write to a temporary file first, concurrent jobs never read
+            # a partial table
+            tmp_file = '{0}.{1}.tmp.npz'.format(cache_file[:-4], os.getpid())
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.savez(tmp_file, masses=table.masses, labels=table.labels)
+                os.replace(tmp_file, cache_file)
+            except OSError:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+        _gap_tables[key] = table
+        return table
+
+    def lookup(self, delta, tolerance=0.02):
+        """
+        Return all combinations explaining the mass difference `delta`.
+
+        Args:
+            delta (float): mass difference in dalton
+            tolerance (float, optional): absolute tolerance in dalton
+
+        Returns:
+            list of tuple: (label, mass), sorted by mass
+        """
+        start, stop = self.lookup_ranges(delta, tolerance=tolerance)
+        return list(
+            zip(self.labels[start:stop].tolist(), self.masses[start:stop].tolist())
+        )
+
+    def lookup_ranges(self, deltas, tolerance=0.02):
+        """
+        Binary search many mass differences at once.
+
+        Args:
+            deltas (float or np.ndarray): mass differences in dalton
+            tolerance (float, optional): absolute tolerance in dalton
+
+        Returns:
+            tuple: start and stop index into `masses` and `labels` for every
+                delta, empty ranges have start == stop
+        """
+        deltas = np.asarray(deltas)
+        start = np.searchsorted(self.masses, deltas - tolerance, side='left')
+        stop = np.searchsorted(self.masses, deltas + tolerance, side='right')
+        return start, stop
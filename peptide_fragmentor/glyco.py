@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Fragmentation of glycopeptides.
+
+Fragment types are generated by the functions registered in
+`glyco_fragment_types`, each one gets the GlycoFragment0r instance and
+returns an array with GLYCO_FRAGMENT_DTYPE. Built in are
+
+    peptide: ladder ions from `peptide_fragmentor.fragment_starts_forward`
+        and `fragment_starts_reverse`, ions containing the glycosite carry
+        the retained (partial) glycans, i.e. the glycan loss ladders
+    Yg: intact peptide + every partial glycan, series `Yg` to not collide
+        with the `Y` ladder ion, pos is the peptide length
+    oxonium: glycan oxonium/diagnostic ions from
+        `peptide_fragmentor.oxonium_ions`, singly charged, pos is 0
+
+The field `glycan` holds the retained partial glycan or the oxonium ion
+name. All partial glycans are enumerated as one array and fragments of each
+type are deduplicated by mass. By default partial glycans attached to the
+peptide must keep a HexNAc, the reducing end of N-glycans and of most
+O-glycans.
+"""
+import re
+
+import numpy as np
+
+import peptide_fragmentor
+from peptide_fragmentor.masses import (
+    FRAGMENT_DTYPE,
+    residue_masses,
+    precursor_mass,
+    composition_mass,
+    ion_offsets,
+    ion_ladders,
+    expand_charges,
+    add_fields,
+)
+
+
+GLYCO_FIELDS = [('glycan', 'U64')]
+GLYCO_FRAGMENT_DTYPE = np.dtype(FRAGMENT_DTYPE.descr + GLYCO_FIELDS)
+
+GLYCAN_PATTERN = re.compile(r'(?P<monosaccharide>[A-Za-z]+)(\((?P<count>[0-9]+)\))?')
+GLYCAN_STRING_PATTERN = re.compile(r'(?:[A-Za-z]+(?:\([0-9]+\))?)+')
+
+
+def parse_glycan(glycan):
+    """
+    Parse glycan in unimod format, e.g. HexNAc(2)Hex(5)dHex(1).
+
+    Returns:
+        dict: monosaccharide -> count, in order of appearance
+
+    Raises:
+        ValueError: if `glycan` is not in unimod format, e.g. HexNAc2
+    """
+    if glycan != '' and GLYCAN_STRING_PATTERN.fullmatch(glycan) is None:
+        raise ValueError('Cannot parse glycan {0}'.format(glycan))
+    counts = {}
+    for match in GLYCAN_PATTERN.finditer(glycan):
+        monosaccharide = match.group('monosaccharide')
+        if monosaccharide not in peptide_fragmentor.monosaccharide_compositions:
+            raise KeyError(
+                'Unknown monosaccharide {0}, add it to '
+                'peptide_fragmentor.monosaccharide_compositions'.format(monosaccharide)
+            )
+        count = match.group('count')
+        counts[monosaccharide] = counts.get(monosaccharide, 0) + int(count or 1)
+    return counts
+
+
+def glycan_label(counts, monosaccharides):
+    """
+    Format a count vector over `monosaccharides` in unimod format.
+    """
+    return ''.join(
+        '{0}({1})'.format(monosaccharide, count)
+        for monosaccharide, count in zip(monosaccharides, counts)
+        if count > 0
+    )
+
+
+def glyco_fragments(series, pos, mass, glycan, charges):
+    """
+    Build a GLYCO_FRAGMENT_DTYPE array with every fragment in every charge.
+    """
+    return add_fields(
+        expand_charges(series, pos, mass, charges),
+        GLYCO_FIELDS,
+        glycan=np.tile(glycan, len(charges)),
+    )
+
+
+def dedupe_by_mass(fragments, decimals=5):
+    """
+    Drop fragments with the same series, charge and mass (rounded to
+    `decimals`), the first occurrence is kept.
+    """
+    if len(fragments) == 0:
+        return fragments
+    mass = np.round(fragments['mass'], decimals)
+    # lexsort is stable, i.e. the first occurrence comes first
+    order = np.lexsort((mass, fragments['charge'], fragments['series']))
+    mass = mass[order]
+    charge = fragments['charge'][order]
+    series = fragments['series'][order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = (mass[1:] != mass[:-1]) | (charge[1:] != charge[:-1]) | \
+        (series[1:] != series[:-1])
+    return fragments[np.sort(order[keep])]
+
+
+def _peptide_fragments(fragger):
+    n = len(fragger.masses)
+    ion_length = np.arange(1, n + 1, dtype=np.int32)
+    retained_masses = fragger.retained_counts @ fragger.monosaccharide_masses
+    retained_labels = np.array(
+        [glycan_label(c, fragger.monosaccharides) for c in fragger.retained_counts],
+        dtype='U64'
+    )
+    glycan_lost = np.all(fragger.retained_counts == 0, axis=1)
+    ladders = ion_ladders(fragger.masses, ions=fragger.ions)
+    fragments = []
+    for ion, (is_forward, offset) in ion_offsets(fragger.ions).items():
+        if is_forward:
+            has_site = ion_length >= fragger.glycosite
+        else:
+            has_site = ion_length >= n - fragger.glycosite + 1
+        mass = ladders[ion][:, None] + retained_masses[None, :]
+        rows, cols = np.nonzero(has_site[:, None] | glycan_lost[None, :])
+        fragments.append(
+            glyco_fragments(
+                np.full(len(rows), ion, dtype='U8'),
+                ion_length[rows],
+                mass[rows, cols],
+                retained_labels[cols],
+                fragger.charges,
+            )
+        )
+    return np.concatenate(fragments)
+
+
+def _Yg_fragments(fragger):
+    mass = precursor_mass(fragger.masses) + \
+        fragger.partial_counts @ fragger.monosaccharide_masses
+    labels = np.array(
+        [glycan_label(c, fragger.monosaccharides) for c in fragger.partial_counts],
+        dtype='U64'
+    )
+    return glyco_fragments(
+        np.full(len(mass), 'Yg', dtype='U8'),
+        np.full(len(mass), len(fragger.masses), dtype=np.int32),
+        mass,
+        labels,
+        fragger.charges,
+    )
+
+
+def _oxonium_fragments(fragger):
+    names = list(peptide_fragmentor.oxonium_ions.keys())
+    required = np.zeros((len(names), len(fragger.monosaccharides)), dtype=np.int32)
+    available = np.ones(len(names), dtype=bool)
+    offsets = np.zeros(len(names))
+    for i, name in enumerate(names):
+        oxonium_ion = peptide_fragmentor.oxonium_ions[name]
+        for monosaccharide, count in oxonium_ion['glycan'].items():
+            if monosaccharide in fragger.monosaccharides:
+                required[i, fragger.monosaccharides.index(monosaccharide)] = count
+            else:
+                available[i] = False
+        offsets[i] = composition_mass(oxonium_ion['cc'])
+    available &= np.all(required <= fragger.counts, axis=1)
+    mass = (required @ fragger.monosaccharide_masses + offsets)[available]
+    return glyco_fragments(
+        np.full(len(mass), 'oxonium', dtype='U8'),
+        np.zeros(len(mass), dtype=np.int32),
+        mass,
+        np.array(names, dtype='U64')[available],
+        [1],
+    )
+
+
+glyco_fragment_types = {
+    'peptide': _peptide_fragments,
+    'Yg': _Yg_fragments,
+    'oxonium': _oxonium_fragments,
+}
+
+
+class GlycoFragment0r:
+    def __init__(self, upep, glycan, glycosite, fragment_types=None, ions=None,
+                 charges=None, retained_glycans=None, require_hexnac=True,
+                 decimals=5):
+        """
+        Initialize GlycoFragment0r with peptide `upep` carrying `glycan`.
+
+        Args:
+            upep (str): Peptide with optional Unimod modification string, the
+                glycan is not part of it
+            glycan (str): Glycan composition in unimod format, e.g.
+                HexNAc(2)Hex(5)
+            glycosite (int): glycosylated residue, 1 is the first residue
+            fragment_types (list of str, optional): keys of
+                `glyco_fragment_types`, default is all registered types
+            ions (list of str, optional): Ion series, default is b, y
+            charges (list, optional): Charges for frag ion creation, default
+                is 1, 2, 3
+            retained_glycans (list of str, optional): Glycans retained by
+                ladder ions containing the glycosite, default is every
+                partial glycan. Complete glycan loss is always included.
+            require_hexnac (bool, optional): partial glycans on the peptide
+                (retained and Yg) need at least one HexNAc, the monosaccharide
+                linked to the peptide. Default is True, set False e.g. for
+                O-mannosylation.
+            decimals (int, optional): fragments are deduplicated by mass
+                rounded to `decimals`
+        """
+        if fragment_types is None:
+            fragment_types = list(glyco_fragment_types.keys())
+        if ions is None:
+            ions = ['b', 'y']
+        self.ions = ions
+        if charges is None:
+            charges = [1, 2, 3]
+        self.charges = charges
+
+        self.upep = upep
+        self.masses = residue_masses(upep)
+        if not 1 <= glycosite <= len(self.masses):
+            raise ValueError(
+                'Glycosite {0} outside of peptide with {1} residues'.format(
+                    glycosite, len(self.masses)
+                )
+            )
+        self.glycosite = glycosite
+
+        glycan_counts = parse_glycan(glycan)
+        self.monosaccharides = list(glycan_counts.keys())
+        self.counts = np.array(list(glycan_counts.values()), dtype=np.int32)
+        self.monosaccharide_masses = np.array(
+            [
+                composition_mass(peptide_fragmentor.monosaccharide_compositions[m])
+                for m in self.monosaccharides
+            ]
+        )
+        # every composition from nothing up to the complete glycan
+        self.partial_counts = np.indices(tuple(self.counts + 1)).reshape(
+            len(self.counts), -1
+        ).T.astype(np.int32)
+        if require_hexnac:
+            self.partial_counts = self.partial_counts[
+                self._has_hexnac(self.partial_counts)
+            ]
+        if retained_glycans is None:
+            self.retained_counts = self.partial_counts
+        else:
+            self.retained_counts = self._glycans_to_counts([''] + retained_glycans)
+            if require_hexnac and not np.all(self._has_hexnac(self.retained_counts)):
+                raise ValueError(
+                    'Retained glycans without HexNAc, set require_hexnac=False'
+                )
+
+        self.fragments = np.concatenate(
+            [
+                dedupe_by_mass(glyco_fragment_types[fragment_type](self), decimals)
+                for fragment_type in fragment_types
+            ]
+        )
+
+    def _has_hexnac(self, counts):
+        """
+        True for every empty glycan or glycan with at least one HexNAc.
+        """
+        has_hexnac = np.all(counts == 0, axis=1)
+        if 'HexNAc' in self.monosaccharides:
+            has_hexnac |= counts[:, self.monosaccharides.index('HexNAc')] > 0
+        return has_hexnac
+
+    def _glycans_to_counts(self, glycans):
+        counts = np.zeros((len(glycans), len(self.monosaccharides)), dtype=np.int32)
+        for i, glycan in enumerate(glycans):
+            for monosaccharide, count in parse_glycan(glycan).items():
+                if monosaccharide not in self.monosaccharides:
+                    raise ValueError(
+                        'Retained glycan {0} is not part of the glycan'.format(glycan)
+                    )
+                counts[i, self.monosaccharides.index(monosaccharide)] = count
+            if np.any(counts[i] > self.counts):
+                raise ValueError(
+                    'Retained glycan {0} is larger than the glycan'.format(glycan)
+                )
+        return counts
@@ -3,10 +3,94 @@
 Attributes:
     neutral_losses (dict): Description
     PROTON (float): Mass of a proton in dalton
+    element_masses (dict): Monoisotopic masses of the elements in dalton
+    amino_acid_compositions (dict): Chemical compositions of the amino acid
+        residues, i.e. without the water of the free amino acid
+    unimod_compositions (dict): Chemical compositions of common unimod
+        modifications, used by the numpy only mass calculation
+    fragment_starts_forward (dict): Composition offsets of the N-terminal
+        ion series
+    fragment_starts_reverse (dict): Composition offsets of the C-terminal
+        ion series
+    crosslinkers (dict): Compositions of cross-linkers, cleavable linkers
+        list the stubs remaining on each peptide after linker cleavage
+    monosaccharide_compositions (dict): Chemical compositions of the
+        monosaccharide residues
+    oxonium_ions (dict): Glycan oxonium/diagnostic ions, given as required
+        monosaccharides plus a composition offset
+    gap_modifications (dict): Modified residues considered when explaining
+        mass gaps, unimod -> amino acids
 
 """
 PROTON = 1.007276466583
 
+element_masses = {
+    'C': 12.0,
+    'H': 1.00782503207,
+    'N': 14.0030740048,
+    'O': 15.99491461956,
+    'P': 30.97376163,
+    'S': 31.97207100,
+}
+
+# keep it alphabetically sorted
+amino_acid_compositions = {
+    'A': {'C': 3, 'H': 5, 'N': 1, 'O': 1},
+    'C': {'C': 3, 'H': 5, 'N': 1, 'O': 1, 'S': 1},
+    'D': {'C': 4, 'H': 5, 'N': 1, 'O': 3},
+    'E': {'C': 5, 'H': 7, 'N': 1, 'O': 3},
+    'F': {'C': 9, 'H': 9, 'N': 1, 'O': 1},
+    'G': {'C': 2, 'H': 3, 'N': 1, 'O': 1},
+    'H': {'C': 6, 'H': 7, 'N': 3, 'O': 1},
+    'I': {'C': 6, 'H': 11, 'N': 1, 'O': 1},
+    'K': {'C': 6, 'H': 12, 'N': 2, 'O': 1},
+    'L': {'C': 6, 'H': 11, 'N': 1, 'O': 1},
+    'M': {'C': 5, 'H': 9, 'N': 1, 'O': 1, 'S': 1},
+    'N': {'C': 4, 'H': 6, 'N': 2, 'O': 2},
+    'P': {'C': 5, 'H': 7, 'N': 1, 'O': 1},
+    'Q': {'C': 5, 'H': 8, 'N': 2, 'O': 2},
+    'R': {'C': 6, 'H': 12, 'N': 4, 'O': 1},
+    'S': {'C': 3, 'H': 5, 'N': 1, 'O': 2},
+    'T': {'C': 4, 'H': 7, 'N': 1, 'O': 2},
+    'V': {'C': 5, 'H': 9, 'N': 1, 'O': 1},
+    'W': {'C': 11, 'H': 10, 'N': 2, 'O': 1},
+    'Y': {'C': 9, 'H': 9, 'N': 1, 'O': 2},
+}
+
+# keep it alphabetically sorted
+unimod_compositions = {
+    'Acetyl': {'C': 2, 'H': 2, 'O': 1},
+    'Amidated': {'H': 1, 'N': 1, 'O': -1},
+    'Carbamidomethyl': {'C': 2, 'H': 3, 'N': 1, 'O': 1},
+    'Deamidated': {'H': -1, 'N': -1, 'O': 1},
+    'Dimethyl': {'C': 2, 'H': 4},
+    'Gln->pyro-Glu': {'H': -3, 'N': -1},
+    'Glu->pyro-Glu': {'H': -2, 'O': -1},
+    'GG': {'C': 4, 'H': 6, 'N': 2, 'O': 2},
+    'Methyl': {'C': 1, 'H': 2},
+    'Oxidation': {'O': 1},
+    'Phospho': {'H': 1, 'O': 3, 'P': 1},
+    'Trimethyl': {'C': 3, 'H': 6},
+}
+
+fragment_starts_forward = {
+        'a': {'cc': {'C': -1, 'O': -1}, 'name_format_string' : 'a{pos}'},
+        'b': {'cc': {}, 'name_format_string' : 'b{pos}'},
+        'c': {'cc': {'N': +1, 'H': +3}, 'name_format_string' : 'c{pos}'},
+        # 'c(-1)': {'cc': {'N': +1, 'H': +2}, 'name_format_string' : 'c)-1){pos}'},
+        # 'c(+1)': {'cc': {'N': +1, 'H': +4}, 'name_format_string' : 'c)+1){pos}'},
+        # 'c(+2)': {'cc': {'N': +1, 'H': +5}, 'name_format_string' : 'c)+2){pos}'},
+}
+fragment_starts_reverse = {
+        'x': {'cc': {'O': 2, 'C': 1}, 'name_format_string' : 'x{pos}'},
+        'y': {'cc': {'H': 2, 'O': 1}, 'name_format_string' : 'y{pos}'},
+        'Y': {'cc': {'H': 0, 'O': 1}, 'name_format_string' : 'Y{pos}'},
+        'z': {'cc': {'O': 1, 'N': -1, 'H': 0}, 'name_format_string' : 'z{pos}'},
+        # 'z(+1)': {'cc': {'O': 1, 'N': -1, 'H': 1}, 'name_format_string' : 'z(+1){pos}'},
+        # 'z(+2)': {'cc': {'O': 1, 'N': -1, 'H': 2}, 'name_format_string' : 'z(+2){pos}'},
+        # 'z(+3)': {'cc': {'O': 1, 'N': -1, 'H': 3}, 'name_format_string' : 'z(+3){pos}'},
+}
+
 # keep it alphabetically sorted
 neutral_losses = {
     'A' : [{}],
@@ -121,6 +205,63 @@ neutral_losses = {
     ],
 }
 
+# keep it alphabetically sorted
+crosslinkers = {
+    'BS3': {
+        'cc': {'C': 8, 'H': 10, 'O': 2},
+        'cleavage_products': {},
+    },
+    'DSS': {
+        'cc': {'C': 8, 'H': 10, 'O': 2},
+        'cleavage_products': {},
+    },
+    'DSSO': {
+        'cc': {'C': 6, 'H': 6, 'O': 3, 'S': 1},
+        # alkene and sulfenic acid stubs add up to the intact linker,
+        # the thiol stub is the sulfenic acid after water loss
+        'cleavage_products': {
+            'A': {'C': 3, 'H': 2, 'O': 1},
+            'S': {'C': 3, 'H': 4, 'O': 2, 'S': 1},
+            'T': {'C': 3, 'H': 2, 'O': 1, 'S': 1},
+        },
+    },
+}
+
+# keep it alphabetically sorted
+monosaccharide_compositions = {
+    'dHex': {'C': 6, 'H': 10, 'O': 4},
+    'Hex': {'C': 6, 'H': 10, 'O': 5},
+    'HexNAc': {'C': 8, 'H': 13, 'N': 1, 'O': 5},
+    'NeuAc': {'C': 11, 'H': 17, 'N': 1, 'O': 8},
+    'NeuGc': {'C': 11, 'H': 17, 'N': 1, 'O': 9},
+    'Pent': {'C': 5, 'H': 8, 'O': 4},
+}
+
+oxonium_ions = {
+    'HexNAc': {'glycan': {'HexNAc': 1}, 'cc': {}},
+    'HexNAc-H2O': {'glycan': {'HexNAc': 1}, 'cc': {'H': -2, 'O': -1}},
+    'HexNAc-2H2O': {'glycan': {'HexNAc': 1}, 'cc': {'H': -4, 'O': -2}},
+    'HexNAc-C2H4O2': {'glycan': {'HexNAc': 1}, 'cc': {'C': -2, 'H': -4, 'O': -2}},
+    'HexNAc-C2H6O3': {'glycan': {'HexNAc': 1}, 'cc': {'C': -2, 'H': -6, 'O': -3}},
+    'HexNAc-CH6O3': {'glycan': {'HexNAc': 1}, 'cc': {'C': -1, 'H': -6, 'O': -3}},
+    'Hex': {'glycan': {'Hex': 1}, 'cc': {}},
+    'HexHexNAc': {'glycan': {'Hex': 1, 'HexNAc': 1}, 'cc': {}},
+    'dHexHexHexNAc': {'glycan': {'dHex': 1, 'Hex': 1, 'HexNAc': 1}, 'cc': {}},
+    'NeuAc': {'glycan': {'NeuAc': 1}, 'cc': {}},
+    'NeuAc-H2O': {'glycan': {'NeuAc': 1}, 'cc': {'H': -2, 'O': -1}},
+    'NeuAcHexHexNAc': {'glycan': {'NeuAc': 1, 'Hex': 1, 'HexNAc': 1}, 'cc': {}},
+    'NeuGc': {'glycan': {'NeuGc': 1}, 'cc': {}},
+    'NeuGc-H2O': {'glycan': {'NeuGc': 1}, 'cc': {'H': -2, 'O': -1}},
+}
+
+# keep it alphabetically sorted
+gap_modifications = {
+    'Carbamidomethyl': ['C'],
+    'Deamidated': ['N', 'Q'],
+    'Oxidation': ['M'],
+    'Phospho': ['S', 'T', 'Y'],
+}
+
 """
 A 71.037113785
 C 103.00918495900001
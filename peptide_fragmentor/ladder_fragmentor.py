@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Mutable fragmenter for peptides that are edited or extended.
+
+The prefix (a, b, c) and suffix (x, y, z) ladders are kept as cumulative
+residue mass arrays and are updated in place, i.e. appending, removing or
+substituting a residue or changing a modification costs O(n) instead of
+fragmenting the new peptide from scratch.
+"""
+import numpy as np
+
+from peptide_fragmentor.masses import (
+    split_upep,
+    residue_masses,
+    modification_mass,
+    ion_offsets,
+    ladders_to_fragments,
+    amino_acid_masses,
+)
+
+
+class LadderFragment0r:
+    def __init__(self, upep='', ions=None, charges=None):
+        """
+        Initialize LadderFragment0r with peptide `upep`.
+
+        Args:
+            upep (str, optional): Peptide with optional Unimod modification
+                string in the format PEPTIDE#<UNIMOD_NAME>:<POS>;... , can be
+                empty to start a de novo ladder
+            ions (list of str, optional): Ion series, default is a, b, y
+            charges (list, optional): Charges for frag ion creation, default
+                is 1, 2, 3
+        """
+        if ions is None:
+            ions = ['a', 'b', 'y']
+        self.ions = ions
+        if charges is None:
+            charges = [1, 2, 3]
+        self.charges = charges
+
+        peptide, mods = split_upep(upep)
+        self._sequence = list(peptide)
+        # keyed by upep position, i.e. 0 is the N-Term and 1 the side chain
+        # of the first residue
+        self._mods = {}
+        for unimod, pos in mods:
+            self._check_pos(pos, first=0)
+            if pos in self._mods:
+                raise ValueError(
+                    'More than one modification at position {0}'.format(pos)
+                )
+            self._mods[pos] = unimod
+        self._masses = residue_masses(upep)
+        self._prefix = np.cumsum(self._masses)
+        self._suffix = np.cumsum(self._masses[::-1])
+
+    def __len__(self):
+        return len(self._sequence)
+
+    @property
+    def peptide(self):
+        return ''.join(self._sequence)
+
+    @property
+    def upep(self):
+        if len(self._mods) == 0:
+            return self.peptide
+        return '{0}#{1}'.format(
+            self.peptide,
+            ';'.join(
+                '{0}:{1}'.format(unimod, pos)
+                for pos, unimod in sorted(self._mods.items())
+            )
+        )
+
+    @property
+    def residue_masses(self):
+        return self._masses.copy()
+
+    def append(self, aa, unimod=None):
+        """
+        Append residue `aa`, optionally carrying `unimod`, at the C-Term.
+        """
+        mass = amino_acid_masses()[aa]
+        if len(self._sequence) == 0 and 0 in self._mods:
+            # N-Term mod is counted for the first residue
+            mass += modification_mass(self._mods[0])
+        if unimod is not None:
+            mass += modification_mass(unimod)
+            self._mods[len(self._sequence) + 1] = unimod
+        self._sequence.append(aa)
+        self._masses = np.append(self._masses, mass)
+        last = self._prefix[-1] if len(self._prefix) > 0 else 0.0
+        self._prefix = np.append(self._prefix, last + mass)
+        # every suffix gains the new residue, new y1 is the residue itself
+        self._suffix = np.concatenate(([mass], self._suffix + mass))
+
+    def pop(self):
+        """
+        Remove the C-terminal residue, returns the removed amino acid.
+        """
+        aa = self._sequence.pop()
+        mass = self._masses[-1]
+        self._mods.pop(len(self._sequence) + 1, None)
+        self._masses = self._masses[:-1]
+        self._prefix = self._prefix[:-1]
+        self._suffix = self._suffix[1:] - mass
+        return aa
+
+    def substitute(self, pos, aa):
+        """
+        Replace the residue at `pos` (1 is the first residue) with `aa`.
+
+        A modification at `pos` is kept.
+
+        Raises:
+            ValueError: if `pos` is not a residue of the peptide
+        """
+        self._check_pos(pos, first=1)
+        aa_masses = amino_acid_masses()
+        delta = aa_masses[aa] - aa_masses[self._sequence[pos - 1]]
+        self._sequence[pos - 1] = aa
+        self._shift(pos, delta)
+
+    def set_modification(self, pos, unimod=None):
+        """
+        Set `unimod` at `pos`, replacing a present modification.
+
+        Position 0 is the N-Term, its mass is counted for the first residue.
+        Passing None removes the modification at `pos`.
+
+        Raises:
+            ValueError: if `pos` is neither the N-Term nor a residue of the
+                peptide
+        """
+        self._check_pos(pos, first=0)
+        delta = 0.0
+        old_unimod = self._mods.pop(pos, None)
+        if old_unimod is not None:
+            delta -= modification_mass(old_unimod)
+        if unimod is not None:
+            delta += modification_mass(unimod)
+            self._mods[pos] = unimod
+        self._shift(pos, delta)
+
+    def _check_pos(self, pos, first=1):
+        if len(self._sequence) == 0:
+            raise ValueError('Peptide is empty')
+        if not first <= pos <= len(self._sequence):
+            raise ValueError(
+                'Position {0} outside of peptide with {1} residues'.format(
+                    pos, len(self._sequence)
+                )
+            )
+
+    def _shift(self, pos, delta):
+        n = len(self._sequence)
+        pos = max(pos, 1)
+        self._masses[pos - 1] += delta
+        self._prefix[pos - 1:] += delta
+        self._suffix[n - pos:] += delta
+
+    def ladders(self, ions=None):
+        """
+        Return the neutral masses of the ion series, see `masses.ion_ladders`.
+        """
+        if ions is None:
+            ions = self.ions
+        ladders = {}
+        for ion, (is_forward, offset) in ion_offsets(ions).items():
+            if is_forward:
+                ladders[ion] = self._prefix + offset
+            else:
+                ladders[ion] = self._suffix + offset
+        return ladders
+
+    def fragments(self, ions=None, charges=None):
+        """
+        Return the fragments of the current peptide.
+
+        Returns:
+            np.ndarray: structured array with dtype masses.FRAGMENT_DTYPE
+        """
+        if charges is None:
+            charges = self.charges
+        return ladders_to_fragments(self.ladders(ions=ions), charges=charges)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Array based fragment mass calculation.
+
+Only depends on numpy, i.e. masses can be calculated without loading
+pandas, pyqms and the unimod XML. Modifications are resolved through
+`peptide_fragmentor.unimod_compositions`, neutral losses are not part of
+this path, use `PeptideFragment0r` for those.
+"""
+import numpy as np
+
+import peptide_fragmentor
+
+
+FRAGMENT_DTYPE = np.dtype(
+    [
+        ('series', 'U8'),
+        ('pos', np.int32),
+        ('charge', np.int32),
+        ('mass', np.float64),
+        ('mz', np.float64),
+    ]
+)
+
+
+def composition_mass(cc):
+    """
+    Calculate the monoisotopic mass of a chemical composition.
+
+    Args:
+        cc (dict): element -> count, e.g. {'H': 2, 'O': 1}
+
+    Returns:
+        float: mass in dalton
+    """
+    element_masses = peptide_fragmentor.element_masses
+    return sum(element_masses[element] * count for element, count in cc.items())
+
+
+def split_upep(upep):
+    """
+    Split `upep` into the bare peptide and its modifications.
+
+    Args:
+        upep (str): Peptide with optional Unimod modification string in the
+            format PEPTIDE#<UNIMOD_NAME>:<POS>;<UNIMOD_NAME>:<POS> ...
+
+    Returns:
+        tuple: peptide (str) and list of (unimod name, pos) tuples
+    """
+    split = upep.split('#')
+    peptide = split[0]
+    mods = []
+    if len(split) == 2:
+        for mod in split[1].split(';'):
+            if mod == '':
+                continue
+            name, pos = mod.rsplit(':', 1)
+            mods.append((name, int(pos)))
+    return peptide, mods
+
+
+def modification_mass(unimod):
+    """
+    Return the mass shift of `unimod`.
+
+    Raises:
+        KeyError: if `unimod` is not in `peptide_fragmentor.unimod_compositions`
+    """
+    try:
+        cc = peptide_fragmentor.unimod_compositions[unimod]
+    except KeyError:
+        raise KeyError(
+            'Unknown unimod {0}, add it to peptide_fragmentor.unimod_compositions '
+            'or use PeptideFragment0r'.format(unimod)
+        )
+    return composition_mass(cc)
+
+
+def residue_masses(upep):
+    """
+    Calculate the mass of every (modified) residue of `upep`.
+
+    Modifications at position 0 (N-Term) are counted for the first residue,
+    like pyqms does, modifications at position n + 1 (C-Term) for the last.
+
+    Args:
+        upep (str): Peptide with optional Unimod modification string
+
+    Returns:
+        np.ndarray: residue masses, one per amino acid
+
+    Raises:
+        ValueError: if a modification is outside of 0 ... n + 1
+    """
+    peptide, mods = split_upep(upep)
+    aa_masses = amino_acid_masses()
+    masses = np.array([aa_masses[aa] for aa in peptide], dtype=np.float64)
+    for unimod, pos in mods:
+        if len(peptide) == 0 or not 0 <= pos <= len(peptide) + 1:
+            raise ValueError(
+                'Modification {0}:{1} outside of peptide with {2} residues'.format(
+                    unimod, pos, len(peptide)
+                )
+            )
+        pos = min(max(pos, 1), len(peptide))
+        masses[pos - 1] += modification_mass(unimod)
+    return masses
+
+
+def precursor_mass(masses):
+    """
+    Return the neutral mass of the peptide with the given residue masses.
+    """
+    return masses.sum() + composition_mass({'H': 2, 'O': 1})
+
+
+def ion_offsets(ions=None):
+    """
+    Return the mass offset of each ion series relative to the residue sum.
+
+    Args:
+        ions (list of str, optional): ion series, default is a, b, y
+
+    Returns:
+        dict: ion -> (forward (bool), offset (float))
+    """
+    if ions is None:
+        ions = ['a', 'b', 'y']
+    offsets = {}
+    for ion in ions:
+        if ion in peptide_fragmentor.fragment_starts_forward:
+            start = peptide_fragmentor.fragment_starts_forward[ion]
+            offsets[ion] = (True, composition_mass(start['cc']))
+        elif ion in peptide_fragmentor.fragment_starts_reverse:
+            start = peptide_fragmentor.fragment_starts_reverse[ion]
+            offsets[ion] = (False, composition_mass(start['cc']))
+    return offsets
+
+
+def ion_ladders(masses, ions=None):
+    """
+    Calculate the neutral masses of the ion series from residue masses.
+
+    Args:
+        masses (np.ndarray): residue masses as returned by `residue_masses`
+        ions (list of str, optional): ion series, default is a, b, y
+
+    Returns:
+        dict: ion -> np.ndarray, element i is the mass of ion i + 1,
+            e.g. ladders['y'][0] is y1
+    """
+    forward = np.cumsum(masses)
+    reverse = np.cumsum(masses[::-1])
+    ladders = {}
+    for ion, (is_forward, offset) in ion_offsets(ions).items():
+        if is_forward:
+            ladders[ion] = forward + offset
+        else:
+            ladders[ion] = reverse + offset
+    return ladders
+
+
+def mass_to_mz(mass, charge):
+    """
+    Return the m/z of neutral `mass` carrying `charge` protons.
+    """
+    return (mass + charge * peptide_fragmentor.PROTON) / charge
+
+
+def block_index(offsets, lengths):
+    """
+    Return the indices that gather blocks out of a concatenated array.
+
+    Block i is array[offsets[i]:offsets[i] + lengths[i]], the indices of all
+    blocks are returned in one array, in order of `offsets`.
+
+    Args:
+        offsets (np.ndarray): start index of every block
+        lengths (np.ndarray): length of every block
+
+    Returns:
+        np.ndarray: int64 indices, lengths.sum() in total
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    return np.repeat(offsets - starts, lengths) + np.arange(lengths.sum())
+
+
+def expand_charges(series, pos, mass, charges):
+    """
+    Build a FRAGMENT_DTYPE array with every fragment in every charge.
+
+    Args:
+        series (np.ndarray): ion series per fragment
+        pos (np.ndarray): position per fragment
+        mass (np.ndarray): neutral mass per fragment
+        charges (list): charges, the fragments are repeated per charge
+
+    Returns:
+        np.ndarray: structured array with dtype FRAGMENT_DTYPE, all fragments
+            of the first charge come first
+    """
+    charges = np.asarray(charges, dtype=np.int32)
+    fragments = np.empty(len(mass) * len(charges), dtype=FRAGMENT_DTYPE)
+    fragments['series'] = np.tile(series, len(charges))
+    fragments['pos'] = np.tile(pos, len(charges))
+    fragments['charge'] = np.repeat(charges, len(mass))
+    fragments['mass'] = np.tile(mass, len(charges))
+    fragments['mz'] = mass_to_mz(fragments['mass'], fragments['charge'])
+    return fragments
+
+
+def ladders_to_fragments(ladders, charges=None):
+    """
+    Expand ion ladders over `charges` into a FRAGMENT_DTYPE array.
+
+    Args:
+        ladders (dict): ion -> np.ndarray as returned by `ion_ladders`
+        charges (list, optional): default is 1, 2, 3
+
+    Returns:
+        np.ndarray: structured array with dtype FRAGMENT_DTYPE
+    """
+    if charges is None:
+        charges = [1, 2, 3]
+    n_ions = sum(len(ladder) for ladder in ladders.values())
+    if n_ions == 0:
+        return np.empty(0, dtype=FRAGMENT_DTYPE)
+    series = np.concatenate(
+        [np.full(len(ladder), ion, dtype='U8') for ion, ladder in ladders.items()]
+    )
+    pos = np.concatenate(
+        [np.arange(1, len(ladder) + 1, dtype=np.int32) for ladder in ladders.values()]
+    )
+    mass = np.concatenate(list(ladders.values()))
+    return expand_charges(series, pos, mass, charges)
+
+
+def add_fields(fragments, fields, **values):
+    """
+    Return a copy of `fragments` extended by `fields`.
+
+    Args:
+        fragments (np.ndarray): structured array, e.g. with FRAGMENT_DTYPE
+        fields (list): (name, dtype) tuples of the new fields
+        **values: value or array per new field
+
+    Returns:
+        np.ndarray: structured array with the fields of `fragments` + `fields`
+    """
+    extended = np.empty(len(fragments), dtype=fragments.dtype.descr + fields)
+    for name in fragments.dtype.names:
+        extended[name] = fragments[name]
+    for name, value in values.items():
+        extended[name] = value
+    return extended
+
+
+def fragment_masses(upep, ions=None, charges=None):
+    """
+    Calculate fragment ion masses of `upep` using numpy only.
+
+    Args:
+        upep (str): Peptide with optional Unimod modification string in the
+            format PEPTIDE#<UNIMOD_NAME>:<POS>;<UNIMOD_NAME>:<POS> ...
+        ions (list of str, optional): ion series, default is a, b, y
+        charges (list, optional): default is 1, 2, 3
+
+    Returns:
+        np.ndarray: structured array with dtype FRAGMENT_DTYPE
+    """
+    return ladders_to_fragments(
+        ion_ladders(residue_masses(upep), ions=ions), charges=charges
+    )
+
+
+_aa_masses = {}
+
+
+def amino_acid_masses():
+    """
+    Return amino acid -> residue mass, calculated once from the knowledge base.
+    """
+    if len(_aa_masses) == 0:
+        for aa, cc in peptide_fragmentor.amino_acid_compositions.items():
+            _aa_masses[aa] = composition_mass(cc)
+    return _aa_masses
@@ -1,12 +1,9 @@
 #!/usr/bin/env python3
-from itertools import combinations
 from collections import defaultdict as ddict
 import pandas as pd
 import numpy as np
-import pyqms
 from pyqms.chemical_composition import ChemicalComposition
 import copy
-import pprint
 
 import peptide_fragmentor
 
@@ -47,23 +44,12 @@ class PeptideFragment0r:
         if len(split) == 2:
             self.mods = split[1].split(';')
 
-        self.fragment_starts_forward = {
-                'a': {'cc': {'C': -1, 'O': -1}, 'name_format_string' : 'a{pos}'},
-                'b': {'cc': {}, 'name_format_string' : 'b{pos}'},
-                'c': {'cc': {'N': +1, 'H': +3}, 'name_format_string' : 'c{pos}'},
-                # 'c(-1)': {'cc': {'N': +1, 'H': +2}, 'name_format_string' : 'c)-1){pos}'},
-                # 'c(+1)': {'cc': {'N': +1, 'H': +4}, 'name_format_string' : 'c)+1){pos}'},
-                # 'c(+2)': {'cc': {'N': +1, 'H': +5}, 'name_format_string' : 'c)+2){pos}'},
-        }
-        self.fragment_starts_reverse = {
-                'x': {'cc': {'O': 2, 'C': 1}, 'name_format_string' : 'x{pos}'},
-                'y': {'cc': {'H': 2, 'O': 1}, 'name_format_string' : 'y{pos}'},
-                'Y': {'cc': {'H': 0, 'O': 1}, 'name_format_string' : 'Y{pos}'},
-                'z': {'cc': {'O': 1, 'N': -1, 'H': 0}, 'name_format_string' : 'z{pos}'},
-                # 'z(+1)': {'cc': {'O': 1, 'N': -1, 'H': 1}, 'name_format_string' : 'z(+1){pos}'},
-                # 'z(+2)': {'cc': {'O': 1, 'N': -1, 'H': 2}, 'name_format_string' : 'z(+2){pos}'},
-                # 'z(+3)': {'cc': {'O': 1, 'N': -1, 'H': 3}, 'name_format_string' : 'z(+3){pos}'},
-        }
+        self.fragment_starts_forward = copy.deepcopy(
+            peptide_fragmentor.fragment_starts_forward
+        )
+        self.fragment_starts_reverse = copy.deepcopy(
+            peptide_fragmentor.fragment_starts_reverse
+        )
         abc_ions = self._fragfest(forward=True, start_dict={ k:v for k, v in self.fragment_starts_forward.items() if k in ions })
         xyz_ions = self._fragfest(forward=False, start_dict={ k:v for k, v in self.fragment_starts_reverse.items() if k in ions})
         ions = [abc_ions, xyz_ions]
@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+
+from peptide_fragmentor import (
+    crosslink_fragments,
+    crosslink_library,
+    fragment_masses,
+    residue_masses,
+)
+
+PROTON = 1.007276466583
+WATER = 18.0105646837
+DSSO = 158.0038
+BS3 = 138.0681
+
+
+def _get(fragments, chain, series, pos, charge=1):
+    mask = (
+        (fragments['chain'] == chain) &
+        (fragments['series'] == series) &
+        (fragments['pos'] == pos) &
+        (fragments['charge'] == charge)
+    )
+    assert mask.sum() == 1
+    return fragments[mask][0]
+
+
+def test_unlinked_fragments_equal_linear_fragments():
+    fragments = crosslink_fragments('PEPKTIDE', 'AKR', 4, 2, ions=['b', 'y'], charges=[1])
+    linear = fragment_masses('PEPKTIDE', ions=['b', 'y'], charges=[1])
+    for series, pos in [('b', 3), ('y', 4)]:
+        expected = linear[(linear['series'] == series) & (linear['pos'] == pos)][0]
+        assert pytest.approx(_get(fragments, 'alpha', series, pos)['mz'], 1e-6) == expected['mz']
+
+
+def test_linked_fragments_carry_partner():
+    fragments = crosslink_fragments('PEPKTIDE', 'AKR', 4, 2, linker='BS3', ions=['b', 'y'], charges=[1])
+    linear = fragment_masses('PEPKTIDE', ions=['b', 'y'], charges=[1])
+    beta_mass = residue_masses('AKR').sum() + WATER
+    for series, pos in [('b', 4), ('y', 5)]:
+        expected = linear[(linear['series'] == series) & (linear['pos'] == pos)][0]
+        assert pytest.approx(_get(fragments, 'alpha', series, pos)['mz'], 1e-6) == \
+            expected['mz'] + beta_mass + BS3
+    # no signature ions for non cleavable linkers
+    assert not np.any(np.char.startswith(fragments['series'], '+'))
+
+
+def test_cleavable_linker_signature_doublets():
+    fragments = crosslink_fragments('PEPKTIDE', 'AKR', 4, 2, linker='DSSO', charges=[1])
+    alpha_mass = residue_masses('PEPKTIDE').sum() + WATER
+    alkene = _get(fragments, 'alpha', '+A', 8)
+    thiol = _get(fragments, 'alpha', '+T', 8)
+    sulfenic = _get(fragments, 'alpha', '+S', 8)
+    assert pytest.approx(alkene['mz'], 1e-6) == alpha_mass + 54.0106 + PROTON
+    assert pytest.approx(thiol['mz'] - alkene['mz'], 1e-5) == 31.9721
+    assert pytest.approx(alkene['mass'] + sulfenic['mass'] - alpha_mass, 1e-6) == \
+        alpha_mass + DSSO
+    _get(fragments, 'beta', '+T', 3)
+
+
+def test_link_position_outside_chain():
+    with pytest.raises(ValueError):
+        crosslink_fragments('PEPKTIDE', 'AKR', 9, 2)
+
+
+def test_library_matches_single_pairs():
+    pairs = [
+        ('PEPKTIDE', 'AKR', 4, 2),
+        ('PEPKTIDE', 'KLLK', 4, 1),
+        ('AKR', 'KLLK', 2, 4),
+    ]
+    library = crosslink_library(pairs, charges=[1, 2])
+    for pair, args in enumerate(pairs):
+        single = crosslink_fragments(*args, charges=[1, 2])
+        assert np.allclose(library[library['pair'] == pair]['mz'], single['mz'])
+
+
+def test_library_reuses_chains_with_other_partners():
+    pairs = [
+        ('PEPKTIDE', 'AKR', 4, 2),
+        ('PEPKTIDE', 'KLLK', 4, 1),
+        ('PEPKTIDE', 'KLLK', 4, 4),
+    ]
+    library = crosslink_library(pairs, linker='BS3', ions=['b'], charges=[1])
+    linear = fragment_masses('PEPKTIDE', ions=['b'], charges=[1])
+    b4 = linear[linear['pos'] == 4][0]['mass']
+    for pair, partner in enumerate(['AKR', 'KLLK', 'KLLK']):
+        fragments = library[library['pair'] == pair]
+        partner_mass = residue_masses(partner).sum() + WATER
+        assert pytest.approx(_get(fragments, 'alpha', 'b', 4)['mass'], 1e-6) == \
+            b4 + partner_mass + BS3
+        assert pytest.approx(_get(fragments, 'alpha', 'b', 3)['mass'], 1e-6) == \
+            linear[linear['pos'] == 3][0]['mass']
+
+
+def test_empty_library():
+    library = crosslink_library([])
+    assert len(library) == 0
+    assert 'pair' in library.dtype.names
@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+
+from peptide_fragmentor import (
+    reverse_decoy,
+    shuffle_decoy,
+    target_decoy_fragments,
+    fragment_masses,
+)
+
+
+def test_reverse_decoy_keeps_c_term():
+    assert reverse_decoy('PEPTIDEK') == 'EDITPEPK'
+
+
+def test_reverse_decoy_moves_modifications():
+    assert reverse_decoy('PEMTIDEK#Oxidation:3;Acetyl:0;GG:8') == \
+        'EDITMEPK#Acetyl:0;Oxidation:5;GG:8'
+
+
+def test_shuffle_decoy_is_seeded():
+    decoy = shuffle_decoy('PEPTIDEKAAR#Phospho:4', seed=3)
+    assert decoy == shuffle_decoy('PEPTIDEKAAR#Phospho:4', seed=3)
+    peptide, mods = decoy.split('#')
+    assert peptide != 'PEPTIDEKAAR'
+    assert peptide[-1] == 'R'
+    assert sorted(peptide) == sorted('PEPTIDEKAAR')
+    pos = int(mods.split(':')[1])
+    assert peptide[pos - 1] == 'T'
+
+
+@pytest.mark.parametrize('method', ['reverse', 'shuffle'])
+def test_target_decoy_fragments_match_fragmented_decoys(method):
+    upeps = ['PEPTIDEK', 'PEMTIDEK#Oxidation:3;Acetyl:0', 'ACDK#Carbamidomethyl:2']
+    fragments, decoys = target_decoy_fragments(upeps, method=method, seed=1, charges=[1, 2])
+    assert len(decoys) == len(upeps)
+    for i, (target, decoy) in enumerate(zip(upeps, decoys)):
+        for upep, is_decoy in [(target, False), (decoy, True)]:
+            selected = fragments[(fragments['peptide'] == i) & (fragments['decoy'] == is_decoy)]
+            expected = fragment_masses(upep, charges=[1, 2])
+            assert list(selected['series']) == list(expected['series'])
+            assert np.allclose(selected['mz'], expected['mz'])
+
+
+def test_decoys_equal_to_target_are_none():
+    assert reverse_decoy('PEPEPK') is None
+    assert reverse_decoy('LAIK') is None
+    assert shuffle_decoy('AAK', seed=1) is None
+    # modifications make the decoy differ
+    assert reverse_decoy('SSK#Phospho:1') == 'SSK#Phospho:2'
+    fragments, decoys = target_decoy_fragments(['AAK', 'PEPTIDEK'], method='shuffle', seed=1)
+    assert decoys[0] is None
+    assert decoys[1] is not None
+    assert not np.any(fragments[fragments['peptide'] == 0]['decoy'])
+    assert np.any(fragments[fragments['peptide'] == 1]['decoy'])
+
+
+def test_shuffle_retries_until_decoy_differs():
+    for seed in range(500):
+        assert shuffle_decoy('LIAK', seed=seed) is not None
+    for seed in range(200):
+        assert shuffle_decoy('SSK#Phospho:1', seed=seed) == 'SSK#Phospho:2'
+
+
+def test_unknown_decoy_method():
+    with pytest.raises(ValueError):
+        target_decoy_fragments(['PEPTIDEK'], method='mirror')
@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+
+from peptide_fragmentor import dia_fragment_tables, fragment_masses
+from peptide_fragmentor.dia import assign_windows, flag_interference
+from peptide_fragmentor.masses import residue_masses, precursor_mass, mass_to_mz
+
+
+PRECURSORS = [
+    ('PEPTIDEK', 2),
+    ('PEPTIDEK', 1),
+    ('ELVISLIVESK', 2),
+    ('ACDEFGHIK#Carbamidomethyl:2', 2),
+]
+
+
+def _precursor_mzs(precursors):
+    return np.array(
+        [mass_to_mz(precursor_mass(residue_masses(upep)), charge) for upep, charge in precursors]
+    )
+
+
+def test_precursor_mzs():
+    mzs = _precursor_mzs([('PEPTIDEK', 1), ('PEPTIDEK', 2)])
+    assert pytest.approx(mzs[0], 1e-6) == 928.462204
+    assert pytest.approx(mzs[1], 1e-6) == (928.462204 + 1.007276) / 2
+
+
+def test_assign_windows_with_overlap():
+    mzs = np.array([410.0, 500.0, 405.0, 650.0])
+    windows = [(400, 425), (424, 450), (495, 505), (800, 900)]
+    assigned = assign_windows(mzs, windows)
+    assert [list(a) for a in assigned] == [[0, 2], [], [1], []]
+    with pytest.raises(ValueError):
+        assign_windows(mzs, [(425, 400)])
+
+
+def test_dia_fragment_tables():
+    mzs = _precursor_mzs(PRECURSORS)
+    windows = [(mz - 1, mz + 1) for mz in mzs[:2]]
+    tables = dia_fragment_tables(PRECURSORS, windows, charges=[1, 2])
+    assert len(tables) == 2
+    for table in tables:
+        assert np.all(np.diff(table['mz']) >= 0)
+        assert set(table['precursor']) <= set(range(len(PRECURSORS)))
+    # PEPTIDEK 2+ only window 0, fragments up to charge 2
+    first = tables[0][tables[0]['precursor'] == 0]
+    expected = np.sort(fragment_masses('PEPTIDEK', charges=[1, 2])['mz'])
+    assert np.allclose(first['mz'], expected)
+    # PEPTIDEK 1+ only singly charged fragments
+    second = tables[1][tables[1]['precursor'] == 1]
+    assert set(second['charge']) == {1}
+    assert not np.any(tables[0]['interference'])
+
+
+def test_interference_flags():
+    precursors = [('PEPTIDEK', 2), ('PEPTIDER', 2)]
+    mzs = _precursor_mzs(precursors)
+    tables = dia_fragment_tables(
+        precursors,
+        [(mzs.min() - 1, mzs.max() + 1)],
+        ions=['b', 'y'],
+        charges=[1],
+        interference_tolerance=0.01,
+    )
+    table = tables[0]
+    # identical b ions (except the full length b8) are shared
+    shared = table[(table['series'] == 'b') & (table['pos'] < 8)]
+    assert np.all(shared['interference'])
+    assert not np.any(table[table['series'] == 'y']['interference'])
+
+
+def test_charge_states_of_one_peptide_do_not_interfere():
+    precursors = [('PEPTIDEK', 1), ('PEPTIDEK', 2), ('PEPTIDER', 2)]
+    tables = dia_fragment_tables(
+        precursors,
+        [(0, 2000)],
+        ions=['y'],
+        charges=[1],
+        interference_tolerance=0.01,
+    )
+    assert len(tables[0]) == 3 * 8
+    assert not np.any(tables[0]['interference'])
+
+
+def test_precursor_mzs_match_table_assignment():
+    mzs = _precursor_mzs(PRECURSORS)
+    tables = dia_fragment_tables(PRECURSORS, [(mz - 0.001, mz + 0.001) for mz in mzs])
+    for i, table in enumerate(tables):
+        assert i in set(table['precursor'])
+
+
+def test_empty_window():
+    tables = dia_fragment_tables(PRECURSORS, [(0, 1)])
+    assert len(tables[0]) == 0
+
+
+def test_flag_interference_same_precursor_only():
+    mz = np.array([100.0, 100.001, 200.0, 200.001, 300.0])
+    precursor = np.array([0, 0, 0, 1, 1])
+    flags = flag_interference(mz, precursor, 0.01)
+    assert list(flags) == [False, False, True, True, False]
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+import numpy as np
+
+from peptide_fragmentor import GapTable
+from peptide_fragmentor.gap_table import gap_units
+
+
+def test_build_sorted_and_complete():
+    table = GapTable.build(max_length=2, modifications={})
+    # 20 amino acids, 20 + 20 * 21 / 2 combinations
+    assert len(table) == 230
+    assert np.all(np.diff(table.masses) >= 0)
+
+
+def test_lookup_single_and_combined_residues():
+    table = GapTable.build(max_length=3)
+    labels = [label for label, mass in table.lookup(57.02146, tolerance=0.001)]
+    assert labels == ['G']
+    labels = [label for label, mass in table.lookup(114.04293, tolerance=0.001)]
+    assert sorted(labels) == ['G+G', 'N']
+    labels = [label for label, mass in table.lookup(71.03711 + 147.0354, tolerance=0.001)]
+    assert 'A+M[Oxidation]' in labels
+    assert table.lookup(0.5) == []
+
+
+def test_lookup_ranges_vectorized():
+    table = GapTable.build(max_length=2)
+    deltas = np.array([57.02146, 0.5, 128.09496])
+    start, stop = table.lookup_ranges(deltas, tolerance=0.001)
+    assert list(stop - start) == [1, 0, 1]
+    assert table.labels[start[2]] == 'K'
+
+
+def test_load_caches_to_disk(tmp_path):
+    modifications = {'Oxidation': ['M']}
+    table = GapTable.load(max_length=2, modifications=modifications, cache_dir=str(tmp_path))
+    cached = [f for f in os.listdir(tmp_path) if f.endswith('.npz')]
+    assert len(cached) == 1
+    assert GapTable.load(max_length=2, modifications=modifications) is table
+    with np.load(os.path.join(tmp_path, cached[0])) as loaded:
+        assert np.array_equal(loaded['masses'], table.masses)
+        assert np.array_equal(loaded['labels'], table.labels)
+
+
+def test_load_with_unwritable_cache_dir(tmp_path):
+    not_a_dir = tmp_path / 'file'
+    not_a_dir.write_text('')
+    table = GapTable.load(max_length=1, cache_dir=str(not_a_dir / 'cache'))
+    assert np.array_equal(table.masses, GapTable.build(max_length=1).masses)
+    assert GapTable.load(max_length=1) is table
+
+
+def test_gap_units_include_modified_residues():
+    labels, masses = gap_units({'Phospho': ['S']})
+    assert 'S[Phospho]' in labels
+    assert pytest.approx(masses[labels.index('S[Phospho]')], 1e-6) == 87.032028 + 79.966331
@@ -0,0 +1,125 @@
+import pytest
+import numpy as np
+
+from peptide_fragmentor import GlycoFragment0r, fragment_masses, residue_masses
+from peptide_fragmentor.glyco import parse_glycan, glyco_fragment_types, dedupe_by_mass
+
+PROTON = 1.007276466583
+WATER = 18.0105646837
+HEXNAC = 203.079372
+HEX = 162.052824
+
+
+def _select(fragments, series, **kwargs):
+    mask = fragments['series'] == series
+    for field, value in kwargs.items():
+        mask &= fragments[field] == value
+    return fragments[mask]
+
+
+def test_parse_glycan():
+    assert parse_glycan('HexNAc(2)Hex(5)dHex') == {'HexNAc': 2, 'Hex': 5, 'dHex': 1}
+    with pytest.raises(KeyError):
+        parse_glycan('Foo(1)')
+    for glycan in ['HexNAc2Hex5', 'HexNAc(2) Hex(5)', 'HexNAc(2)Hex(5']:
+        with pytest.raises(ValueError):
+            parse_glycan(glycan)
+
+
+def test_oxonium_ions():
+    fragger = GlycoFragment0r('NGTK', 'HexNAc(2)Hex(3)', 1, fragment_types=['oxonium'])
+    oxonium = fragger.fragments
+    assert set(oxonium['charge']) == {1}
+    mz = dict(zip(oxonium['glycan'], oxonium['mz']))
+    assert pytest.approx(mz['HexNAc'], 1e-6) == 204.086649
+    assert pytest.approx(mz['HexNAc-C2H6O3'], 1e-6) == 126.054955
+    assert pytest.approx(mz['HexNAc-CH6O3'], 1e-6) == 138.054955
+    assert pytest.approx(mz['HexHexNAc'], 1e-6) == 366.139472
+    assert 'NeuAc' not in mz
+
+
+def test_Yg_ions():
+    fragger = GlycoFragment0r('NGTK', 'HexNAc(2)Hex(3)', 1, fragment_types=['Yg'], charges=[1])
+    y_ions = fragger.fragments
+    # 3 * 4 partial glycans without the 3 HexNAc free ones
+    assert len(y_ions) == 9
+    assert len(_select(y_ions, 'Yg', glycan='Hex(1)')) == 0
+    assert set(y_ions['pos']) == {4}
+    peptide_mass = residue_masses('NGTK').sum() + WATER
+    y1 = _select(y_ions, 'Yg', glycan='HexNAc(1)')[0]
+    assert pytest.approx(y1['mz'], 1e-6) == peptide_mass + HEXNAC + PROTON
+    intact = _select(y_ions, 'Yg', glycan='HexNAc(2)Hex(3)')[0]
+    assert pytest.approx(intact['mass'], 1e-6) == peptide_mass + 2 * HEXNAC + 3 * HEX
+
+
+def test_peptide_fragments_retain_glycan_only_with_site():
+    fragger = GlycoFragment0r(
+        'PENGTK', 'HexNAc(2)Hex(1)', 3,
+        fragment_types=['peptide'],
+        charges=[1],
+        retained_glycans=['HexNAc(1)'],
+    )
+    linear = fragment_masses('PENGTK', ions=['b', 'y'], charges=[1])
+    b2 = _select(fragger.fragments, 'b', pos=2)
+    assert list(b2['glycan']) == ['']
+    b3 = _select(fragger.fragments, 'b', pos=3)
+    assert sorted(b3['glycan']) == ['', 'HexNAc(1)']
+    expected = linear[(linear['series'] == 'b') & (linear['pos'] == 3)][0]['mass']
+    assert pytest.approx(sorted(b3['mass']), 1e-6) == [expected, expected + HEXNAC]
+    assert list(_select(fragger.fragments, 'y', pos=3)['glycan']) == ['']
+    assert len(_select(fragger.fragments, 'y', pos=4)) == 2
+
+
+def test_peptide_fragments_all_partial_glycans():
+    fragger = GlycoFragment0r('NGTK', 'HexNAc(2)Hex(3)', 1, fragment_types=['peptide'], charges=[1, 2])
+    b1 = _select(fragger.fragments, 'b', pos=1, charge=2)
+    assert len(b1) == 9
+    assert len(np.unique(b1['mass'])) == 9
+
+
+def test_require_hexnac_option():
+    fragger = GlycoFragment0r(
+        'NGTK', 'HexNAc(2)Hex(3)', 1, fragment_types=['Yg'], charges=[1], require_hexnac=False
+    )
+    assert len(fragger.fragments) == 12
+    assert len(_select(fragger.fragments, 'Yg', glycan='Hex(3)')) == 1
+    with pytest.raises(ValueError):
+        GlycoFragment0r('NGTK', 'HexNAc(2)Hex(3)', 1, retained_glycans=['Hex(1)'])
+    fragger = GlycoFragment0r(
+        'NGTK', 'HexNAc(2)Hex(3)', 1, fragment_types=['peptide'], charges=[1],
+        retained_glycans=['Hex(1)'], require_hexnac=False,
+    )
+    assert sorted(set(fragger.fragments['glycan'])) == ['', 'Hex(1)']
+
+
+def test_retained_glycans_must_be_part_of_the_glycan():
+    with pytest.raises(ValueError):
+        GlycoFragment0r('NGTK', 'HexNAc(2)', 1, retained_glycans=['HexNAc(5)'])
+    with pytest.raises(ValueError):
+        GlycoFragment0r('NGTK', 'HexNAc(2)', 1, retained_glycans=['HexNAc(1)Hex(1)'])
+
+
+def test_dedupe_by_mass():
+    fragger = GlycoFragment0r('NGTK', 'HexNAc(1)', 1, fragment_types=['Yg'], charges=[1, 2])
+    doubled = np.concatenate([fragger.fragments, fragger.fragments])
+    deduped = dedupe_by_mass(doubled)
+    assert len(deduped) == 4
+    assert np.array_equal(deduped, fragger.fragments)
+
+
+def test_custom_fragment_type():
+    def precursor(fragger):
+        return glyco_fragment_types['Yg'](fragger)[-1:]
+
+    glyco_fragment_types['precursor'] = precursor
+    try:
+        fragger = GlycoFragment0r('NGTK', 'HexNAc(2)', 1, fragment_types=['precursor'], charges=[2])
+    finally:
+        del glyco_fragment_types['precursor']
+    assert len(fragger.fragments) == 1
+    assert fragger.fragments[0]['glycan'] == 'HexNAc(2)'
+
+
+def test_glycosite_outside_peptide():
+    with pytest.raises(ValueError):
+        GlycoFragment0r('NGTK', 'HexNAc(2)', 5)
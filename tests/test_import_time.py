@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+# Generous budget, bare `import peptide_fragmentor` takes a few milliseconds,
+# importing pandas and pyqms takes well above one second.
+IMPORT_TIME_BUDGET = 0.25
+
+
+def _run(code):
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return output.decode().strip()
+
+
+def test_import_does_not_load_heavy_dependencies():
+    loaded = _run(
+        'import sys\n'
+        'import peptide_fragmentor\n'
+        'print(",".join(m for m in ("pandas", "pyqms", "numpy") if m in sys.modules))'
+    )
+    assert loaded == ''
+
+
+def test_mass_calculation_does_not_load_pandas_or_pyqms():
+    loaded = _run(
+        'import sys\n'
+        'from peptide_fragmentor import fragment_masses\n'
+        'fragment_masses("PEPTIDEK#Oxidation:1")\n'
+        'print(",".join(m for m in ("pandas", "pyqms") if m in sys.modules))'
+    )
+    assert loaded == ''
+
+
+def test_import_time():
+    elapsed = float(
+        _run(
+            'import time\n'
+            't = time.perf_counter()\n'
+            'import peptide_fragmentor\n'
+            'print(time.perf_counter() - t)'
+        )
+    )
+    assert elapsed < IMPORT_TIME_BUDGET
@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+
+from peptide_fragmentor import LadderFragment0r, fragment_masses
+
+
+def _assert_same_fragments(fragger, upep):
+    expected = fragment_masses(upep, ions=fragger.ions, charges=fragger.charges)
+    fragments = fragger.fragments()
+    assert fragger.upep == upep
+    assert list(fragments['series']) == list(expected['series'])
+    assert list(fragments['pos']) == list(expected['pos'])
+    assert np.allclose(fragments['mz'], expected['mz'])
+
+
+def test_ladder_matches_fragment_masses():
+    fragger = LadderFragment0r('PEPTIDEK#Oxidation:3')
+    _assert_same_fragments(fragger, 'PEPTIDEK#Oxidation:3')
+
+
+def test_append_and_pop():
+    fragger = LadderFragment0r(ions=['b', 'y'])
+    for aa in 'PEPT':
+        fragger.append(aa)
+    fragger.append('M', unimod='Oxidation')
+    _assert_same_fragments(fragger, 'PEPTM#Oxidation:5')
+    assert fragger.pop() == 'M'
+    _assert_same_fragments(fragger, 'PEPT')
+
+
+def test_substitute():
+    fragger = LadderFragment0r('PEPTIDEK', ions=['a', 'b', 'c', 'x', 'y'])
+    fragger.substitute(3, 'W')
+    _assert_same_fragments(fragger, 'PEWTIDEK')
+
+
+def test_set_and_remove_modification():
+    fragger = LadderFragment0r('PEPSIDEK')
+    fragger.set_modification(4, 'Phospho')
+    _assert_same_fragments(fragger, 'PEPSIDEK#Phospho:4')
+    fragger.set_modification(0, 'Acetyl')
+    _assert_same_fragments(fragger, 'PEPSIDEK#Acetyl:0;Phospho:4')
+    fragger.set_modification(4)
+    _assert_same_fragments(fragger, 'PEPSIDEK#Acetyl:0')
+
+
+def test_n_term_and_first_residue_modification():
+    fragger = LadderFragment0r('CPEPK#Acetyl:0;Carbamidomethyl:1')
+    _assert_same_fragments(fragger, 'CPEPK#Acetyl:0;Carbamidomethyl:1')
+    fragger.set_modification(1, None)
+    _assert_same_fragments(fragger, 'CPEPK#Acetyl:0')
+    fragger = LadderFragment0r('SPEPK#Phospho:1')
+    fragger.set_modification(0, 'Acetyl')
+    _assert_same_fragments(fragger, 'SPEPK#Acetyl:0;Phospho:1')
+    fragger.set_modification(0, None)
+    _assert_same_fragments(fragger, 'SPEPK#Phospho:1')
+
+
+def test_n_term_modification_kept_when_emptied():
+    fragger = LadderFragment0r('K#Acetyl:0')
+    fragger.pop()
+    fragger.append('P')
+    fragger.append('K')
+    _assert_same_fragments(fragger, 'PK#Acetyl:0')
+
+
+def test_positions_are_validated():
+    fragger = LadderFragment0r('PEPK')
+    for pos in [0, 5]:
+        with pytest.raises(ValueError):
+            fragger.substitute(pos, 'W')
+    with pytest.raises(ValueError):
+        fragger.set_modification(5, 'Oxidation')
+    _assert_same_fragments(fragger, 'PEPK')
+    with pytest.raises(ValueError):
+        LadderFragment0r().set_modification(1, 'Oxidation')
+    with pytest.raises(ValueError):
+        LadderFragment0r('PEPK#Oxidation:6')
+
+
+def test_unknown_amino_acid():
+    fragger = LadderFragment0r('PEP')
+    with pytest.raises(KeyError):
+        fragger.append('B')
+    assert fragger.peptide == 'PEP'
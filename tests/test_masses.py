@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+
+from peptide_fragmentor import fragment_masses, residue_masses, FRAGMENT_DTYPE
+from peptide_fragmentor.masses import block_index
+
+
+def _get(fragments, series, pos, charge=1):
+    mask = (
+        (fragments['series'] == series) &
+        (fragments['pos'] == pos) &
+        (fragments['charge'] == charge)
+    )
+    assert mask.sum() == 1
+    return fragments[mask][0]
+
+
+def test_residue_masses():
+    masses = residue_masses('ACK')
+    assert isinstance(masses, np.ndarray)
+    assert pytest.approx(masses, 5e-6) == [
+        71.037113785, 103.00918495900001, 128.09496301439998
+    ]
+
+
+def test_residue_masses_n_term_mod_counted_for_first_residue():
+    masses = residue_masses('KK#Acetyl:0')
+    assert pytest.approx(masses[0], 5e-6) == 128.09496301439998 + 42.010565
+    assert pytest.approx(masses[1], 5e-6) == 128.09496301439998
+
+
+def test_residue_masses_c_term_mod_counted_for_last_residue():
+    masses = residue_masses('KK#Amidated:3')
+    assert pytest.approx(masses[0], 5e-6) == 128.09496301439998
+    assert pytest.approx(masses[1], 5e-6) == 128.09496301439998 - 0.984016
+
+
+@pytest.mark.parametrize('upep', ['PEPK#Oxidation:80', 'PEPK#Oxidation:-3', 'PEPK#Oxidation:6'])
+def test_residue_masses_mod_outside_of_peptide(upep):
+    with pytest.raises(ValueError):
+        residue_masses(upep)
+
+
+def test_residue_masses_unknown_mod():
+    with pytest.raises(KeyError):
+        residue_masses('KK#NotAMod:1')
+
+
+def test_fragment_masses_dtype_and_size():
+    fragments = fragment_masses('MKK', ions=['a', 'b', 'y'], charges=[1, 2])
+    assert fragments.dtype == FRAGMENT_DTYPE
+    assert len(fragments) == 3 * 3 * 2
+
+
+@pytest.mark.parametrize(
+    'upep, series, pos, mz',
+    [
+        ('MK', 'a', 1, 104.05284693456998),
+        ('MKK', 'a', 2, 232.14780994897004),
+        ('KKK', 'b', 3, 385.29216550997),
+        ('MKK', 'c', 2, 277.16932),
+        ('MKK', 'x', 2, 301.18708),
+        ('K', 'y', 1, 147.11280646),
+        ('MKK#Oxidation:1', 'b', 2, 276.1376),
+    ]
+)
+def test_fragment_masses_match_composition_based_values(upep, series, pos, mz):
+    fragments = fragment_masses(upep, ions=[series], charges=[1])
+    row = _get(fragments, series, pos)
+    assert pytest.approx(row['mz'], 5e-6) == mz
+
+
+def test_fragment_masses_higher_charge():
+    fragments = fragment_masses('KK', ions=['y'], charges=[1, 2])
+    y2 = _get(fragments, 'y', 2, charge=1)
+    y2_2 = _get(fragments, 'y', 2, charge=2)
+    assert pytest.approx(y2_2['mz'], 5e-6) == (y2['mz'] + 1.007276466583) / 2
+
+
+def test_block_index():
+    index = block_index([5, 0, 5], [2, 3, 0])
+    assert list(index) == [5, 6, 0, 1, 2]
+    assert len(block_index([], [])) == 0